@@ -0,0 +1,336 @@
+import argparse
+import gc
+import os
+import select
+import signal
+import sys
+import time
+
+import locust.main
+from locust import events
+
+from utils.build_headers import build_common_headers
+from utils.config_loader import load_config, load_cred_config, preload_request_templates
+from utils.data_loader import DataLoader
+from utils.log_helper import Logger, LogType
+# Imported for its side effects so the forked processes start with the task modules already loaded
+import tasks.jfrog_tasks
+import tasks.trace_tasks
+
+
+MASTER_CONFIG = os.path.join('config', 'master_config.yml')
+WORKER_CONFIG = os.path.join('config', 'slave_config.yml')
+STOP_TIMEOUT = 30
+# locust exits with 1 when requests failed, the process itself ran to completion
+FAILED_REQUESTS_EXIT_CODE = 1
+CRASHED_EXIT_CODE = 2
+TRACE_SHARDS_ENV = 'PERF_FROG_TRACE_SHARDS'
+TRACE_SHARD_INDEX_ENV = 'PERF_FROG_TRACE_SHARD_INDEX'
+TRACE_START_AT_ENV = 'PERF_FROG_TRACE_START_AT'
+
+
+def read_locust_config(config_file):
+    config = {}
+    with open(config_file, 'r') as f:
+        for line in f:
+            key, separator, value = line.partition('=')
+            if separator:
+                config[key.strip()] = value.strip()
+    return config
+
+
+def exit_status(exit_code):
+    # waitstatus_to_exitcode reports a signal as -signum, shells report it as 128 + signum
+    return 128 - exit_code if exit_code < 0 else exit_code
+
+
+class LocustProcess:
+
+    def __init__(self, name, locustfile, config_file, extra_args=None, env=None):
+        self.name = name
+        self.locustfile = locustfile
+        self.config_file = config_file
+        self.extra_args = extra_args or []
+        self.env = env or {}
+        self.pid = None
+        self.ready_fd = None
+        self.started_at = None
+        self.ready = False
+        self.restarts = 0
+
+    def start(self):
+        read_fd, write_fd = os.pipe()
+        self.ready = False
+        self.started_at = time.time()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            self._run(write_fd)
+        os.close(write_fd)
+        self.pid = pid
+        self.ready_fd = read_fd
+
+    def _run(self, ready_fd):
+        # Own process group so Ctrl+C reaches only the launcher, which forwards it once.
+        # Locust installs its own handlers and shuts down gracefully with its final stats
+        os.setpgid(0, 0)
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        os.environ.update(self.env)
+
+        def on_init(environment, **kwargs):
+            os.write(ready_fd, b"1")
+            os.close(ready_fd)
+
+        events.init.add_listener(on_init)
+        sys.argv = ['locust', '-f', self.locustfile, '--config', self.config_file, *self.extra_args]
+        exit_code = 0
+        try:
+            locust.main.main()
+        except SystemExit as e:
+            exit_code = e.code if isinstance(e.code, int) else 1
+        except Exception as e:
+            Logger.log_message(f"{self.name} crashed: {str(e)}", LogType.ERROR)
+            exit_code = CRASHED_EXIT_CODE
+        os._exit(exit_code)
+
+    def close_ready_fd(self):
+        if self.ready_fd is not None:
+            os.close(self.ready_fd)
+            self.ready_fd = None
+
+    def terminate(self, signum=signal.SIGTERM):
+        self.close_ready_fd()
+        try:
+            os.kill(self.pid, signum)
+        except ProcessLookupError:
+            pass
+
+
+class LocalLauncher:
+
+    def __init__(self, locustfile, workers, max_restarts, start_master=True, locust_args=None,
+                 trace_shards=None, first_shard=0, trace_start_delay=30):
+        self.locustfile = locustfile
+        self.workers = workers
+        self.max_restarts = max_restarts
+        self.trace_shards = trace_shards or workers
+        self.first_shard = first_shard
+        self.trace_start_delay = trace_start_delay
+        self.start_master = start_master
+        self.locust_args = locust_args or []
+        self.master = None
+        self.processes = {}
+        self.failed_exit_code = None
+        self.stopping_since = None
+
+    @staticmethod
+    def preload():
+        # Everything loaded here is shared copy-on-write with the forked processes
+        start_time = time.time()
+        load_cred_config()
+        build_common_headers()
+        load_config('api_config.yml')
+        preload_request_templates()
+        DataLoader.load_data()
+        gc.freeze()
+        Logger.log_message(f"Preloaded config, templates and {len(DataLoader.data)} test data rows in "
+                           f"{time.time() - start_time:.2f}s")
+
+    def spawn(self, process):
+        process.start()
+        self.processes[process.pid] = process
+
+    def has_locust_arg(self, *names):
+        return any(arg == name or arg.startswith(name + '=') for arg in self.locust_args for name in names)
+
+    def locust_arg_value(self, *names):
+        for position, arg in enumerate(self.locust_args):
+            for name in names:
+                if arg == name and position + 1 < len(self.locust_args):
+                    return self.locust_args[position + 1]
+                if arg.startswith(name + '='):
+                    return arg.split('=', 1)[1]
+        return None
+
+    def trace_master_args(self):
+        # Only a worker that gets a user replays its shard, and that user has to arrive before the replay starts
+        master_config = read_locust_config(MASTER_CONFIG)
+        args = []
+        users = self.locust_arg_value('-u', '--users')
+        if users is None:
+            users = master_config.get('users', '1')
+            if int(users) < self.workers:
+                Logger.log_message(f"Raising users from {users} to {self.workers} so every worker replays its shard")
+                args += ['--users', str(self.workers)]
+        elif int(users) < self.workers:
+            Logger.log_message(f"{users} users for {self.workers} workers, the shards of workers without a user "
+                               f"would never be replayed", LogType.ERROR)
+            return None
+
+        spawn_rate = float(self.locust_arg_value('-r', '--spawn-rate') or master_config.get('spawn-rate', '1'))
+        start_at = self.locust_arg_value('--trace-start-at')
+        start_in = float(start_at) - time.time() if start_at else self.trace_start_delay
+        if self.workers / spawn_rate > start_in:
+            Logger.log_message(f"Reaching one user on each of {self.workers} workers takes "
+                               f"{self.workers / spawn_rate:.0f}s at spawn rate {spawn_rate:g} but the replay starts in "
+                               f"{start_in:.0f}s, records before the users arrive are skipped. Raise -r/--spawn-rate "
+                               f"or --trace-start-delay", LogType.ERROR)
+        return args
+
+    def worker_env(self, index, launch_time):
+        if not self.has_locust_arg('--trace-file'):
+            return {}
+
+        # Handed over outside of the locust options, a worker joining a running test gets the master's
+        # options before init fires. Fixed per worker so a restart replays the same shard against the same start
+        env = {TRACE_SHARDS_ENV: str(self.trace_shards), TRACE_SHARD_INDEX_ENV: str(self.first_shard + index)}
+        if not self.has_locust_arg('--trace-start-at'):
+            env[TRACE_START_AT_ENV] = str(launch_time + self.trace_start_delay)
+        return env
+
+    def run(self):
+        if self.first_shard + self.workers > self.trace_shards:
+            Logger.log_message(f"Shards {self.first_shard}-{self.first_shard + self.workers - 1} do not fit in "
+                               f"{self.trace_shards} trace shards", LogType.ERROR)
+            return 2
+
+        master_args = ['--expect-workers', str(self.workers), *self.locust_args]
+        if self.start_master and self.has_locust_arg('--trace-file'):
+            trace_args = self.trace_master_args()
+            if trace_args is None:
+                return 2
+            master_args += trace_args
+            if not self.has_locust_arg('-t', '--run-time'):
+                Logger.log_message(f"The replay stops at the run-time in {MASTER_CONFIG} even if the trace is longer, "
+                                   f"pass -t/--run-time to cover the whole trace")
+
+        self.preload()
+        launch_time = time.time()
+        signal.signal(signal.SIGINT, self.on_signal)
+        signal.signal(signal.SIGTERM, self.on_signal)
+
+        if self.start_master:
+            self.master = LocustProcess("master", self.locustfile, MASTER_CONFIG, master_args)
+            self.spawn(self.master)
+        for index in range(self.workers):
+            self.spawn(LocustProcess(f"worker-{index}", self.locustfile, WORKER_CONFIG, self.locust_args,
+                                     self.worker_env(index, launch_time)))
+
+        all_ready = False
+        while self.processes:
+            self.collect_ready()
+            ready_workers = [p for p in self.processes.values() if p.ready and p is not self.master]
+            if not all_ready and len(ready_workers) >= self.workers:
+                Logger.log_message(f"All {self.workers} workers ready in {time.time() - launch_time:.2f}s")
+                all_ready = True
+            exit_code = self.reap()
+            if exit_code is not None:
+                return exit_code
+            if self.stopping_since and time.time() - self.stopping_since > STOP_TIMEOUT:
+                Logger.log_message(f"Processes still running {STOP_TIMEOUT}s after stopping, killing them",
+                                   LogType.ERROR)
+                for process in self.processes.values():
+                    process.terminate(signal.SIGKILL)
+                self.stop()
+        return self.failed_exit_code or 0
+
+    def on_signal(self, signum, frame):
+        # Forwarded so locust can shut down on its own, the main loop keeps reaping until every process is gone
+        if self.stopping_since is None:
+            Logger.log_message(f"Got signal {signum}, stopping local processes")
+            self.stopping_since = time.time()
+        for process in self.processes.values():
+            process.terminate(signum)
+
+    def collect_ready(self):
+        waiting = {p.ready_fd: p for p in self.processes.values() if p.ready_fd is not None}
+        if not waiting:
+            time.sleep(0.5)
+            return
+
+        readable, _, _ = select.select(list(waiting), [], [], 0.5)
+        for fd in readable:
+            process = waiting[fd]
+            started = os.read(fd, 1)
+            process.close_ready_fd()
+            if started:
+                process.ready = True
+                Logger.log_message(f"{process.name} (pid {process.pid}) started in "
+                                   f"{time.time() - process.started_at:.2f}s")
+
+    def reap(self):
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return None
+            if pid == 0:
+                return None
+
+            process = self.processes.pop(pid, None)
+            if process is None:
+                continue
+            process.close_ready_fd()
+            exit_code = exit_status(os.waitstatus_to_exitcode(status))
+
+            if process is self.master:
+                Logger.log_message(f"master exited with code {exit_code}, stopping workers")
+                self.stop()
+                return exit_code or self.failed_exit_code or 0
+
+            if exit_code == 0:
+                Logger.log_message(f"{process.name} finished")
+            elif exit_code == FAILED_REQUESTS_EXIT_CODE:
+                Logger.log_message(f"{process.name} finished with failed requests")
+                self.failed_exit_code = self.failed_exit_code or exit_code
+            elif self.stopping_since:
+                Logger.log_message(f"{process.name} exited with code {exit_code} while stopping")
+            elif process.restarts < self.max_restarts:
+                process.restarts += 1
+                Logger.log_message(f"{process.name} exited with code {exit_code}, restarting "
+                                   f"({process.restarts}/{self.max_restarts})", LogType.ERROR)
+                self.spawn(process)
+            else:
+                Logger.log_message(f"{process.name} exited with code {exit_code}, restart limit reached",
+                                   LogType.ERROR)
+                self.failed_exit_code = exit_code
+
+    def stop(self):
+        for process in self.processes.values():
+            process.terminate()
+        for pid in list(self.processes):
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+        self.processes.clear()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Start a locust master and one worker per CPU core, "
+                                                 "any unknown arguments are passed on to locust")
+    parser.add_argument('-f', '--locustfile', default='load_test.py',
+                        help="locustfile to run, e.g. trace_replay.py (default: load_test.py)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help="number of workers to fork (default: CPU core count)")
+    parser.add_argument('--max-restarts', type=int, default=5,
+                        help="restarts allowed per crashed worker")
+    parser.add_argument('--workers-only', action='store_true',
+                        help="only start workers, for boxes joining a remote master")
+    parser.add_argument('--trace-shards', type=int,
+                        help="total trace shards across all boxes when replaying a trace (default: --workers)")
+    parser.add_argument('--first-shard', type=int, default=0,
+                        help="trace shard of this box's first worker, for replays spread over several boxes")
+    parser.add_argument('--trace-start-delay', type=float, default=30,
+                        help="seconds after launch at which all workers start replaying a trace")
+    return parser.parse_known_args()
+
+
+if __name__ == '__main__':
+    args, locust_args = parse_args()
+    launcher = LocalLauncher(args.locustfile, args.workers, args.max_restarts,
+                             start_master=not args.workers_only, locust_args=locust_args,
+                             trace_shards=args.trace_shards, first_shard=args.first_shard,
+                             trace_start_delay=args.trace_start_delay)
+    sys.exit(launcher.run())
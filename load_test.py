@@ -3,6 +3,7 @@ from utils.log_helper import Logger
 import yaml
 import os
 from locust import events, TaskSet, SequentialTaskSet, HttpUser, task, between
+from locust.runners import WorkerRunner
 import time
 
 from utils.data_loader import DataLoader
@@ -12,7 +13,9 @@ from tasks.jfrog_tasks import JfrogOperations
 @events.init.add_listener
 def on_test_start(environment, **kwargs):
     DataLoader.load_data()
-    EventInfluxHandlers.init_influx_client()
+    # Only the master (or a local run) resets the metrics database, a restarted worker must not wipe it
+    if not isinstance(environment.runner, WorkerRunner):
+        EventInfluxHandlers.init_influx_client()
 
 @events.quitting.add_listener
 def on_test_stop(environment, **kwargs):
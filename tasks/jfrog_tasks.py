@@ -1,20 +1,20 @@
 from locust import task, SequentialTaskSet, events, between
 import json
 import os
-import yaml
 import uuid
 import subprocess
 import base64
 import time
 
 from utils.build_headers import build_common_headers
+from utils.config_loader import load_config, load_cred_config, load_request_template
 from utils.log_helper import Logger
 from utils.data_loader import DataLoader
 from utils.influxdb_client import EventInfluxHandlers
 
 
 class JfrogOperations(SequentialTaskSet):
-    header = build_common_headers()
+    header = None
     repo_name = None
     policy_name = None
     watch_name = None
@@ -24,12 +24,9 @@ class JfrogOperations(SequentialTaskSet):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.task_id = str(uuid.uuid4())[:8]
-        config_path = os.path.join(os.getcwd(), 'config', 'api_config.yml')
-        with open(config_path, 'r') as f:
-            self.api_config = yaml.safe_load(f)
-        creds_path = os.path.join(os.getcwd(), 'config', 'creds.yml')
-        with open(creds_path, 'r') as f:
-            self.creds = yaml.safe_load(f)
+        self.header = build_common_headers()
+        self.api_config = load_config('api_config.yml')
+        self.creds = load_cred_config()
 
     def on_start(self):
         if JfrogOperations._test_stopped:
@@ -95,9 +92,7 @@ class JfrogOperations(SequentialTaskSet):
         success = False
         
         try:
-            template_path = os.path.join(os.getcwd(), 'requests', 'create_repository.json')
-            with open(template_path, 'r') as f:
-                request_body = json.load(f)
+            request_body = load_request_template('create_repository.json')
             
             request_body['key'] = self.repo_name
             endpoint = self.api_config['endpoints']['create_repository']
@@ -247,9 +242,7 @@ class JfrogOperations(SequentialTaskSet):
         success = False
         
         try:
-            template_path = os.path.join(os.getcwd(), 'requests', 'create_policy.json')
-            with open(template_path, 'r') as f:
-                request_body = json.load(f)
+            request_body = load_request_template('create_policy.json')
             
             request_body['name'] = self.policy_name
             endpoint = self.api_config['endpoints']['create_policy']
@@ -284,9 +277,7 @@ class JfrogOperations(SequentialTaskSet):
         success = False
         
         try:
-            template_path = os.path.join(os.getcwd(), 'requests', 'create_watch.json')
-            with open(template_path, 'r') as f:
-                request_body = json.load(f)
+            request_body = load_request_template('create_watch.json')
             
             request_body['general_data']['name'] = self.watch_name
             request_body['project_resources']['resources'][0]['name'] = self.repo_name
@@ -323,9 +314,7 @@ class JfrogOperations(SequentialTaskSet):
         success = False
         
         try:
-            template_path = os.path.join(os.getcwd(), 'requests', 'apply_watch.json')
-            with open(template_path, 'r') as f:
-                request_body = json.load(f)
+            request_body = load_request_template('apply_watch.json')
             
             request_body['watch_names'] = [self.watch_name]
             endpoint = self.api_config['endpoints']['apply_watch']
@@ -360,9 +349,7 @@ class JfrogOperations(SequentialTaskSet):
         scan_status = "UNKNOWN"
         
         try:
-            template_path = os.path.join(os.getcwd(), 'requests', 'check_scan_status.json')
-            with open(template_path, 'r') as f:
-                request_body = json.load(f)
+            request_body = load_request_template('check_scan_status.json')
             
             request_body['repo'] = self.repo_name
             endpoint = self.api_config['endpoints']['check_scan_status']
@@ -399,9 +386,7 @@ class JfrogOperations(SequentialTaskSet):
         total_violations = 0
         
         try:
-            template_path = os.path.join(os.getcwd(), 'requests', 'verify_violations.json')
-            with open(template_path, 'r') as f:
-                request_body = json.load(f)
+            request_body = load_request_template('verify_violations.json')
             
             request_body['filters']['watch_name'] = self.watch_name
             request_body['filters']['resources']['artifacts'][0]['repo'] = self.repo_name
@@ -0,0 +1,158 @@
+from locust import task, TaskSet
+from locust.exception import StopUser
+from locust.runners import WorkerRunner
+from gevent.pool import Pool
+import os
+import time
+
+from utils.build_headers import build_common_headers
+from utils.config_loader import load_config, render_request_template, template_cache
+from utils.log_helper import Logger, LogType
+from utils.data_loader import DataLoader
+from utils.trace_loader import TraceLoader
+
+
+class TraceReplayOperations(TaskSet):
+    _replaying = False
+    shard_index = 0
+    shard_count = 0
+    start_at = 0
+    lag_warning_interval = 10
+
+    def on_start(self):
+        # The trace is sharded across workers, so one user per process replays it and the rest stand by
+        if TraceReplayOperations._replaying:
+            raise StopUser()
+        TraceReplayOperations._replaying = True
+
+        self.header = build_common_headers()
+        api_config = load_config('api_config.yml')
+        # Longest path first so /repositories/<key> is not swallowed by a shorter prefix
+        self.endpoints = sorted(
+            ((endpoint['method'], endpoint['path'], name) for name, endpoint in api_config.get('endpoints', {}).items()),
+            key=lambda endpoint: len(endpoint[1]),
+            reverse=True
+        )
+
+    @staticmethod
+    def configure(options):
+        # launcher.py sets these per worker in the environment, a worker that joins a running test
+        # already carries the master's parsed_options by the time init fires
+        TraceReplayOperations.shard_index = int(os.environ.get('PERF_FROG_TRACE_SHARD_INDEX', options.trace_shard_index))
+        TraceReplayOperations.shard_count = int(os.environ.get('PERF_FROG_TRACE_SHARDS', options.trace_shards))
+        TraceReplayOperations.start_at = float(os.environ.get('PERF_FROG_TRACE_START_AT', options.trace_start_at))
+
+    @staticmethod
+    def reset():
+        TraceReplayOperations._replaying = False
+
+    def match_endpoint(self, method, path):
+        path = path.split('?', 1)[0]
+        for endpoint_method, endpoint_path, name in self.endpoints:
+            if method == endpoint_method and (path == endpoint_path or path.startswith(endpoint_path + '/')):
+                return name, endpoint_path
+        return None
+
+    def matched_records(self, records):
+        for record in records:
+            endpoint = self.match_endpoint(record['method'], record['path'])
+            if endpoint is None:
+                self.unmatched += 1
+                continue
+            record['endpoint'] = endpoint
+            yield record
+
+    def build_body(self, endpoint_name, endpoint_path, record):
+        if record['body']:
+            return record['body']
+
+        template_file = f"{endpoint_name}.json"
+        if template_file not in template_cache:
+            return None
+
+        values = dict(DataLoader.cycle_data())
+        resource = record['path'].split('?', 1)[0][len(endpoint_path) + 1:]
+        if resource:
+            values['repo_name'] = resource.split('/', 1)[0]
+        return render_request_template(template_file, values)
+
+    def send_request(self, record):
+        endpoint_name, endpoint_path = record['endpoint']
+        kwargs = {"headers": self.header, "name": endpoint_name}
+        body = self.build_body(endpoint_name, endpoint_path, record)
+        if isinstance(body, str):
+            kwargs["data"] = body
+        elif body is not None:
+            kwargs["json"] = body
+
+        try:
+            self.client.request(record['method'], record['path'], **kwargs)
+        except Exception as e:
+            Logger.log_message(f"Error replaying {record['method']} {record['path']}: {str(e)}", LogType.ERROR)
+
+    @task
+    def replay(self):
+        options = self.user.environment.parsed_options
+        runner = self.user.environment.runner
+        if not options.trace_file:
+            Logger.log_message("No --trace-file given, nothing to replay", LogType.ERROR)
+            runner.quit()
+            return
+
+        shard_count = TraceReplayOperations.shard_count
+        shard_index = TraceReplayOperations.shard_index
+        if not shard_count:
+            if isinstance(runner, WorkerRunner):
+                Logger.log_message("No --trace-shards given to this worker, refusing to replay the whole trace "
+                                   "on every worker", LogType.ERROR)
+                runner.quit()
+                return
+            shard_count = 1
+        if not 0 <= shard_index < shard_count:
+            Logger.log_message(f"--trace-shard-index {shard_index} is outside of {shard_count} shards", LogType.ERROR)
+            runner.quit()
+            return
+
+        pool = Pool(options.trace_concurrency)
+        self.unmatched = 0
+        sent = 0
+        missed = 0
+        late = 0
+        last_warning = 0
+
+        records = self.matched_records(TraceLoader.stream(options.trace_file, shard_index, shard_count))
+        # Every worker schedules against the same start so the shards line up, a worker that
+        # joins after it (e.g. restarted) picks up where the schedule is now
+        replay_start = TraceReplayOperations.start_at or time.time()
+        resume_at = time.time()
+        for record in records:
+            if options.trace_speed > 0:
+                scheduled = replay_start + record['offset'] / options.trace_speed
+                if scheduled < resume_at:
+                    missed += 1
+                    continue
+                delay = scheduled - time.time()
+                if delay > 0:
+                    time.sleep(delay)
+
+            pool.spawn(self.send_request, record)
+            sent += 1
+
+            if options.trace_speed > 0:
+                lag = time.time() - scheduled
+                if lag > 1:
+                    late += 1
+                    if time.time() - last_warning > self.lag_warning_interval:
+                        Logger.log_message(f"Trace shard {shard_index + 1}/{shard_count} is {lag:.1f}s behind "
+                                           f"schedule, raise --trace-concurrency or lower --trace-speed")
+                        last_warning = time.time()
+
+        pool.join()
+        Logger.log_message(f"Replayed trace shard {shard_index + 1}/{shard_count}: {sent} requests sent, "
+                           f"{late} sent over 1s late, {missed} scheduled before this worker joined, "
+                           f"{self.unmatched} not matching any endpoint")
+        # A worker always quits so the master stops the test once the last shard is done
+        if options.headless or isinstance(runner, WorkerRunner):
+            runner.quit()
+        else:
+            raise StopUser()
@@ -0,0 +1,38 @@
+import json
+
+from utils.trace_loader import TraceLoader
+
+
+def write_lines(path, lines):
+    with open(path, 'w') as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def test_stream_deals_every_line_to_one_shard(tmp_path):
+    trace_path = tmp_path / 'trace.jsonl'
+    write_lines(trace_path, [json.dumps({"timestamp": 100 + line, "method": "get", "path": f"/p?line={line}"})
+                             for line in range(10)])
+
+    shards = [list(TraceLoader.stream(trace_path, shard_index, 3)) for shard_index in range(3)]
+
+    assert [len(records) for records in shards] == [4, 3, 3]
+    assert sorted(record['offset'] for records in shards for record in records) == list(range(10))
+    assert [record['path'] for record in shards[1]] == ["/p?line=1", "/p?line=4", "/p?line=7"]
+    assert shards[1][0]['method'] == "GET"
+
+
+def test_stream_measures_offsets_from_first_record_of_any_shard(tmp_path):
+    trace_path = tmp_path / 'access.log'
+    write_lines(trace_path, [
+        'garbage',
+        '1.2.3.4 - u [10/Oct/2025:13:55:36 +0000] "GET /artifactory/api/repositories?x=1 HTTP/1.1" 200 12',
+        '{"startedDateTime": "2025-10-10T13:55:46Z", "request": {"method": "POST", '
+        '"url": "https://a.jfrog.io/xray/api/v1/violations", "postData": {"text": "{}"}}}',
+    ])
+
+    records = list(TraceLoader.stream(trace_path, 0, 2))
+
+    assert len(records) == 1
+    assert records[0]['path'] == "/xray/api/v1/violations"
+    assert records[0]['body'] == "{}"
+    assert records[0]['offset'] == 10
@@ -0,0 +1,85 @@
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TRACE_LINES = 300
+# Checked without importing, importing locust would monkey-patch the test process
+MISSING_DEPENDENCIES = [name for name in ('locust', 'influxdb', 'psutil') if importlib.util.find_spec(name) is None]
+
+
+def write_trace(path, lines, interval):
+    start = 1760000000
+    with open(path, 'w') as f:
+        for line in range(lines):
+            f.write(json.dumps({
+                "timestamp": start + line * interval,
+                "method": "GET",
+                "path": f"/artifactory/api/repositories?line={line}"
+            }) + "\n")
+
+
+def start_server(received):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            line = parse_qs(urlsplit(self.path).query).get('line')
+            if line:
+                received.append((int(line[0]), time.time()))
+            body = b"[]"
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+@pytest.mark.skipif(bool(MISSING_DEPENDENCIES), reason=f"needs {', '.join(MISSING_DEPENDENCIES)}")
+def test_restarted_worker_keeps_its_shard(tmp_path):
+    import psutil
+
+    trace_path = tmp_path / 'trace.jsonl'
+    write_trace(trace_path, TRACE_LINES, 0.1)
+    received = []
+    server = start_server(received)
+    launcher = subprocess.Popen(
+        [sys.executable, 'launcher.py', '-f', 'trace_replay.py', '--workers', '2', '--max-restarts', '1',
+         '--trace-start-delay', '5', '--trace-file', str(trace_path),
+         '-H', f'http://127.0.0.1:{server.server_port}', '--logfile', str(tmp_path / 'run.log')],
+        cwd=REPO_ROOT
+    )
+    try:
+        deadline = time.time() + 60
+        while len(received) < 50:
+            assert time.time() < deadline, "replay never started"
+            time.sleep(0.1)
+
+        # Spawned in order master, worker-0, worker-1
+        worker = sorted(psutil.Process(launcher.pid).children(), key=lambda child: child.pid)[-1]
+        worker.kill()
+        killed_at = time.time()
+        launcher.wait(timeout=150)
+    finally:
+        if launcher.poll() is None:
+            launcher.terminate()
+            launcher.wait()
+        server.shutdown()
+
+    lines = [line for line, _ in received]
+    assert len(lines) == len(set(lines)), "a shard was replayed twice"
+    # worker-1 owns the odd lines, only its restarted process can send them after the kill
+    assert any(line % 2 == 1 and sent_at > killed_at + 1 for line, sent_at in received)
+    assert TRACE_LINES - 1 in lines
@@ -0,0 +1,46 @@
+from utils.influxdb_client import EventInfluxHandlers
+from locust import events, HttpUser, constant
+from locust.runners import WorkerRunner
+
+from utils.config_loader import preload_request_templates
+from utils.data_loader import DataLoader
+from tasks.trace_tasks import TraceReplayOperations
+
+
+@events.init_command_line_parser.add_listener
+def on_parser_init(parser):
+    parser.add_argument("--trace-file", type=str, default="",
+                        help="Access log or HAR-like JSON lines trace to replay")
+    parser.add_argument("--trace-speed", type=float, default=1.0,
+                        help="Replay speed multiplier, 10 replays at 10x, 0 ignores the original timing")
+    parser.add_argument("--trace-shards", type=int, default=0,
+                        help="Number of shards to split the trace into, required on workers "
+                             "(launcher.py sets PERF_FROG_TRACE_SHARDS per worker instead)")
+    parser.add_argument("--trace-shard-index", type=int, default=0,
+                        help="Shard of the trace this worker replays "
+                             "(launcher.py sets PERF_FROG_TRACE_SHARD_INDEX per worker instead)")
+    parser.add_argument("--trace-start-at", type=float, default=0,
+                        help="Epoch time every worker aligns the replay to (default: when the replay starts)")
+    parser.add_argument("--trace-concurrency", type=int, default=100,
+                        help="Maximum in-flight replayed requests per worker")
+
+
+@events.init.add_listener
+def on_test_start(environment, **kwargs):
+    DataLoader.load_data()
+    # Bodies are only rendered for endpoints with a cached template, already loaded when forked by launcher.py
+    preload_request_templates()
+    TraceReplayOperations.configure(environment.parsed_options)
+    if not isinstance(environment.runner, WorkerRunner):
+        EventInfluxHandlers.init_influx_client()
+
+
+@events.test_start.add_listener
+def on_replay_start(environment, **kwargs):
+    TraceReplayOperations.reset()
+
+
+class TraceReplayUser(HttpUser):
+    host = "abc.jfrog.io"
+    wait_time = constant(1)
+    tasks = [TraceReplayOperations]
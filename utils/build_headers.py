@@ -5,8 +5,14 @@ import base64
 from utils.config_loader import load_cred_config
 from utils.log_helper import Logger
 
+headers_cache = None
+
 
 def build_common_headers():
+    global headers_cache
+    if headers_cache is not None:
+        return headers_cache
+
     config = load_cred_config()
     headers = {}
 
@@ -18,4 +24,5 @@ def build_common_headers():
     if content_type:
         headers["Content-Type"] = content_type
 
-    return headers
\ No newline at end of file
+    headers_cache = headers
+    return headers_cache
@@ -1,8 +1,13 @@
 import yaml
 import os
+import copy
+import json
+from string import Template
 from utils.log_helper import Logger
 
 config_cache = None
+file_config_cache = {}
+template_cache = {}
 
 def load_cred_config(config_path=None):
     global config_cache
@@ -21,10 +26,44 @@ def load_cred_config(config_path=None):
         return config_cache
 
 def load_config(config_file):
+    if config_file in file_config_cache:
+        return file_config_cache[config_file]
+
     try:
         config_path = os.path.join(os.getcwd(), 'config', config_file)
         with open(config_path, 'r') as f:
-            return yaml.safe_load(f)
+            file_config_cache[config_file] = yaml.safe_load(f)
+            return file_config_cache[config_file]
     except Exception as e:
         Logger.log_message(f"Error loading config {config_file}: {str(e)}")
-        return {}
\ No newline at end of file
+        return {}
+
+def cache_request_template(template_file):
+    if template_file not in template_cache:
+        template_path = os.path.join(os.getcwd(), 'requests', template_file)
+        with open(template_path, 'r') as f:
+            template_cache[template_file] = json.load(f)
+    return template_cache[template_file]
+
+def load_request_template(template_file):
+    # Callers fill in names per request, so hand out a copy of the cached body
+    return copy.deepcopy(cache_request_template(template_file))
+
+def render_request_template(template_file, values):
+    # Fills the ${...} placeholders of a template with the given values
+    def render(node):
+        if isinstance(node, dict):
+            return {key: render(value) for key, value in node.items()}
+        if isinstance(node, list):
+            return [render(value) for value in node]
+        if isinstance(node, str):
+            return Template(node).safe_substitute(values)
+        return node
+
+    return render(cache_request_template(template_file))
+
+def preload_request_templates():
+    templates_dir = os.path.join(os.getcwd(), 'requests')
+    for template_file in sorted(os.listdir(templates_dir)):
+        if template_file.endswith('.json'):
+            cache_request_template(template_file)
\ No newline at end of file
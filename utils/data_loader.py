@@ -6,15 +6,22 @@ from utils.log_helper import Logger
 class DataLoader:
     data = []
     current_index = 0
+    loaded = False
 
     @staticmethod
-    def load_data():
+    def load_data(reload=False):
+        # The launcher parses the CSV once before forking, workers only rewind
+        if DataLoader.loaded and not reload:
+            DataLoader.current_index = 0
+            return
+
         try:
             data_path = os.path.join(os.getcwd(), 'data', 'test_data.csv')
             with open(data_path, 'r') as f:
                 reader = csv.DictReader(f)
                 DataLoader.data = list(reader)
             DataLoader.current_index = 0
+            DataLoader.loaded = True
         except Exception as e:
             Logger.log_message(f"Error loading test data: {str(e)}")
 
@@ -25,4 +32,14 @@ class DataLoader:
         
         data = DataLoader.data[DataLoader.current_index]
         DataLoader.current_index += 1
+        return data
+
+    @staticmethod
+    def cycle_data():
+        # Like get_data but wraps around instead of running out
+        if not DataLoader.data:
+            return {}
+
+        data = DataLoader.data[DataLoader.current_index % len(DataLoader.data)]
+        DataLoader.current_index += 1
         return data
\ No newline at end of file
@@ -13,26 +13,35 @@ class EventInfluxHandlers:
     database_name = "locustdb"
     table_name = "REST_Table"
     
-    influx_client = InfluxDBClient(
-        host='localhost',
-        port=8086,
-        database=database_name,
-        username='admin',
-        password='admin123'
-    )
+    influx_client = None
+
+    @staticmethod
+    def get_influx_client():
+        # Built on first use so importing this module (or forking after it) opens no connections
+        if EventInfluxHandlers.influx_client is None:
+            EventInfluxHandlers.influx_client = InfluxDBClient(
+                host='localhost',
+                port=8086,
+                database=EventInfluxHandlers.database_name,
+                username='admin',
+                password='admin123'
+            )
+        return EventInfluxHandlers.influx_client
 
     @staticmethod
     def init_influx_client():
         try:
-            EventInfluxHandlers.influx_client.drop_database(EventInfluxHandlers.database_name)
-            EventInfluxHandlers.influx_client.create_database(EventInfluxHandlers.database_name)
-            EventInfluxHandlers.influx_client.switch_database(EventInfluxHandlers.database_name)
+            influx_client = EventInfluxHandlers.get_influx_client()
+            influx_client.drop_database(EventInfluxHandlers.database_name)
+            influx_client.create_database(EventInfluxHandlers.database_name)
+            influx_client.switch_database(EventInfluxHandlers.database_name)
         except Exception as e:
             Logger.log_message(f"Error initializing InfluxDB client: {str(e)}")
 
     @staticmethod
     def get_cpu_usage():
-        return psutil.cpu_percent(interval=1)
+        # Non-blocking, compares against the previous call instead of holding every request for a second
+        return psutil.cpu_percent(interval=None)
 
     @staticmethod
     @events.request.add_listener
@@ -56,7 +65,7 @@ class EventInfluxHandlers:
                         "cpuUsage": cpu_usage
                     }
                 }
-                EventInfluxHandlers.influx_client.write_points([failure_temp])
+                EventInfluxHandlers.get_influx_client().write_points([failure_temp])
             else:
                 success_temp = {
                     "measurement": EventInfluxHandlers.table_name,
@@ -72,7 +81,7 @@ class EventInfluxHandlers:
                         "cpuUsage": cpu_usage
                     }
                 }
-                EventInfluxHandlers.influx_client.write_points([success_temp])
+                EventInfluxHandlers.get_influx_client().write_points([success_temp])
         except Exception as e:
             Logger.log_message(f"Error writing to InfluxDB: {str(e)}")
 
@@ -92,7 +101,7 @@ class EventInfluxHandlers:
                     "cpuUsage": cpu_usage
                 }
             }
-            EventInfluxHandlers.influx_client.write_points([point])
+            EventInfluxHandlers.get_influx_client().write_points([point])
         except Exception as e:
             Logger.log_message(f"Error writing custom metric to InfluxDB: {str(e)}")
 
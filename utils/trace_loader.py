@@ -0,0 +1,97 @@
+import json
+import re
+import datetime
+from urllib.parse import urlsplit
+from utils.log_helper import Logger
+
+
+class TraceLoader:
+    # Common/combined access log line: 1.2.3.4 - user [10/Oct/2025:13:55:36 +0000] "GET /path HTTP/1.1" 200 ...
+    access_log_pattern = re.compile(r'\[(?P<time>[^\]]+)\] "(?P<method>[A-Z]+) (?P<target>\S+)[^"]*"')
+    access_log_time_format = '%d/%b/%Y:%H:%M:%S %z'
+
+    @staticmethod
+    def stream(trace_path, shard_index=0, shard_count=1):
+        # Yields one record at a time so traces of any size never sit in memory. Lines are dealt
+        # round-robin across the shards before parsing, so every worker replays a share of each
+        # peak and only parses its own lines. The first record is always parsed for the trace start
+        skipped = 0
+        trace_start = None
+        with open(trace_path, 'r') as f:
+            for line_number, line in enumerate(f):
+                own_line = line_number % shard_count == shard_index
+                if not own_line and trace_start is not None:
+                    continue
+
+                line = line.strip()
+                if not line:
+                    continue
+
+                record = TraceLoader.parse_line(line)
+                if record is None:
+                    if own_line:
+                        skipped += 1
+                    continue
+
+                if trace_start is None:
+                    trace_start = record['timestamp']
+                if own_line:
+                    record['offset'] = record['timestamp'] - trace_start
+                    yield record
+
+        if skipped:
+            Logger.log_message(f"Skipped {skipped} unparseable lines in {trace_path}")
+
+    @staticmethod
+    def parse_line(line):
+        try:
+            if line.startswith('{'):
+                return TraceLoader.parse_json_line(line)
+            return TraceLoader.parse_access_log_line(line)
+        except (ValueError, KeyError, TypeError, AttributeError):
+            return None
+
+    @staticmethod
+    def parse_access_log_line(line):
+        match = TraceLoader.access_log_pattern.search(line)
+        if not match:
+            return None
+
+        timestamp = datetime.datetime.strptime(match.group('time'), TraceLoader.access_log_time_format)
+        return {
+            "timestamp": timestamp.timestamp(),
+            "method": match.group('method'),
+            "path": TraceLoader.parse_path(match.group('target')),
+            "body": None
+        }
+
+    @staticmethod
+    def parse_json_line(line):
+        # Accepts a HAR entry per line or a flat {"timestamp", "method", "path"/"url", "body"} object
+        entry = json.loads(line)
+        if 'request' in entry:
+            request = entry['request']
+            return {
+                "timestamp": TraceLoader.parse_timestamp(entry['startedDateTime']),
+                "method": request['method'].upper(),
+                "path": TraceLoader.parse_path(request['url']),
+                "body": (request.get('postData') or {}).get('text')
+            }
+
+        return {
+            "timestamp": TraceLoader.parse_timestamp(entry['timestamp']),
+            "method": entry['method'].upper(),
+            "path": TraceLoader.parse_path(entry.get('path') or entry['url']),
+            "body": entry.get('body')
+        }
+
+    @staticmethod
+    def parse_timestamp(value):
+        if isinstance(value, (int, float)):
+            return float(value)
+        return datetime.datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+
+    @staticmethod
+    def parse_path(target):
+        url = urlsplit(target)
+        return f"{url.path}?{url.query}" if url.query else url.path